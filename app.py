@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import logging
 import os
 import random
 import sys
 
 from cassandra.cluster import Cluster
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
 
 import model
 
@@ -22,9 +24,13 @@ KEYSPACE = os.getenv('CASSANDRA_KEYSPACE', 'investments')
 REPLICATION_FACTOR = os.getenv('CASSANDRA_REPLICATION_FACTOR', '1')
 
 
+@functools.lru_cache(maxsize=None)
+def instrument_mock_sum(instrument):
+    return sum(instrument.encode('utf-8'))
+
+
 def get_instrument_value(instrument):
-    instr_mock_sum = sum(bytearray(instrument, encoding='utf-8'))
-    return random.uniform(1.0, instr_mock_sum)
+    return random.uniform(1.0, instrument_mock_sum(instrument))
 
 
 def main():
@@ -55,13 +61,20 @@ def main():
 
     args = parser.parse_args()
 
-    log.info(f"Running command: {args.command} args={args}")
+    log.info("Running command: %s args=%s", args.command, args)
 
     log.info("Connecting to Cluster")
     cluster = None
     session = None
     try:
-        cluster = Cluster(args.cluster_ips.split(','))
+        # token aware routing sends each prepared write straight to a replica owning its partition.
+        # protocol v4 multiplexes up to 32K in-flight requests over one connection per host, so the
+        # driver's pool needs no resizing (set_core/max_connections_per_host are v1/v2 only)
+        cluster = Cluster(
+            contact_points=args.cluster_ips.split(','),
+            protocol_version=4,
+            load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy()),
+        )
         session = cluster.connect()
 
         model.create_keyspace(session, args.keyspace, args.replication_factor)
@@ -81,14 +94,14 @@ def main():
             print(f"- Sample account IDs (first {min(show_n, len(accounts))}):")
             for a in accounts[:show_n]:
                 print('   ', a)
-            log.info(f"Populate finished: accounts={len(accounts)}, positions={result.get('positions_count')}, trades={result.get('trades_count')}")
+            log.info("Populate finished: accounts=%d, positions=%s, trades=%s", len(accounts), result.get('positions_count'), result.get('trades_count'))
         elif args.command == 'accounts':
             username = args.username or args.global_username
             if not username:
                 parser.error('accounts requires --username or provide --username globally')
             model.get_user_accounts(session, username)
         elif args.command == 'positions':
-            log.info(f"Querying positions for account {args.account}")
+            log.info("Querying positions for account %s", args.account)
             model.get_positions_by_account(session, args.account)
         elif args.command == 'trades':
             # dynamically pick the best trade table based on provided filters
@@ -101,12 +114,12 @@ def main():
             else:
                 table_key = 'by_date'
 
-            log.info(f"Querying trades for account {args.account} selected_table={table_key} type={getattr(args,'trade_type',None)} symbol={getattr(args,'symbol',None)} limit={args.limit}")
+            log.info("Querying trades for account %s selected_table=%s type=%s symbol=%s limit=%d", args.account, table_key, getattr(args, 'trade_type', None), getattr(args, 'symbol', None), args.limit)
             model.get_trades_by_account(
                 session,
                 args.account,
-                start_date=args.start,
-                end_date=args.end,
+                start_date=model.parse_date_string(args.start),
+                end_date=model.parse_date_string(args.end),
                 limit=args.limit,
                 table_key=table_key,
                 trade_type=getattr(args, 'trade_type', None),
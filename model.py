@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
+import calendar
 import datetime
+import functools
+import itertools
 import logging
 import random
+import re
 import uuid
 import time
+import threading
 import sys
+import weakref
 
-import time_uuid
-from cassandra.query import BatchStatement
-from tabulate import tabulate
+from cassandra import OperationTimedOut
+from cassandra.query import BatchStatement, BatchType, BoundStatement
 
 from fixtures import DEMO_USERS, DEMO_INSTRUMENTS, DEMO_CONFIG
 
@@ -92,6 +97,15 @@ CREATE_TRADES_BY_ACCOUNT_SYMBOL_TABLE = """
     ) WITH CLUSTERING ORDER BY (symbol ASC, trade_id DESC)
 """
 
+SCHEMA_TABLES = [
+    CREATE_USERS_TABLE,
+    CREATE_POSITIONS_BY_ACCOUNT_TABLE,
+    CREATE_TRADES_BY_ACCOUNT_DATE_TABLE,
+    CREATE_TRADES_BY_ACCOUNT_TYPE_TABLE,
+    CREATE_TRADES_BY_ACCOUNT_SYMBOL_TYPE_TABLE,
+    CREATE_TRADES_BY_ACCOUNT_SYMBOL_TABLE,
+]
+
 SELECT_USER_ACCOUNTS = """
     SELECT username, account_number, name, cash_balance
     FROM accounts_by_user
@@ -110,7 +124,10 @@ SELECT_TRADES_BY_ACCOUNT = """
     WHERE account = ?
 """
 
-# mapping of logical table keys to physical table names and which extra filters they support
+# mapping of logical table keys to physical table names and which extra filters they support.
+# the trades tables are denormalized copies written by the client rather than materialized views:
+# views are experimental and disabled by default since Cassandra 4.0, and every column in the
+# INSERTs is either a primary key column (required) or a regular column stored only once
 TRADE_TABLES = {
     'by_date': {'table': 'trades_by_a_d', 'supports': []},
     'by_type': {'table': 'trades_by_a_td', 'supports': ['type']},
@@ -118,42 +135,157 @@ TRADE_TABLES = {
     'by_symbol': {'table': 'trades_by_a_sd', 'supports': ['symbol']},
 }
 
-def execute_batch(session, stmt, data):
-    batch_size = 10
-    for i in range(0, len(data), batch_size):
-        batch = BatchStatement()
-        chunk = data[i : i+batch_size]
-        for item in chunk:
-            batch.add(stmt, item)
-        log.info(f"Executing batch: statements={len(chunk)}")
-        # retry individual batch execution to provide clearer user feedback on failures
-        last_exc = None
-        for attempt in range(1, 4):
-            try:
-                session.execute(batch, timeout=30)
-                break
-            except Exception as e:
-                last_exc = e
-                log.warning(f"Batch execution failed (attempt {attempt}/3): {e}")
-                if attempt < 3:
-                    time.sleep(2 * attempt)
-                else:
-                    # final failure: log and print a concise error for the user
-                    log.error(f"Batch execution failed after retries: {e}")
-                    print(f"ERROR: failed to execute a batch of {len(chunk)} statements: {e}", file=sys.stderr)
-                    raise
-    log.info(f"Finished executing batches for statement; total_statements={len(data)}")
+# 100ns intervals between the UUID epoch (1582-10-15) and the unix epoch
+UUID_EPOCH_OFFSET = 0x01b21dd213814000
+UUID_TICKS_PER_DAY = 24 * 60 * 60 * 10**7
+# variant bits (10xx...) of the clock_seq_and_node half of an RFC 4122 UUID
+UUID_VARIANT_RFC4122 = 0x8000000000000000
+# clock_seq_and_node values Cassandra's minTimeuuid()/maxTimeuuid() use (it compares these bytes signed)
+TIMEUUID_MIN_CLOCK_SEQ_AND_NODE = 0x8080808080808080
+TIMEUUID_MAX_CLOCK_SEQ_AND_NODE = 0x7f7f7f7f7f7f7f7f
+
+# date or date-time accepted by parse_date_string without going through fromisoformat
+ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ](\d{1,2}):(\d{1,2}):(\d{1,2}))?')
+
+# prepared statements cached per session and CQL string so each query shape is prepared once per session;
+# statements from one Cluster are unknown to another, so the cache must not be shared across sessions
+_PREPARED = weakref.WeakKeyDictionary()
+
+# upper bound of statements per single-partition batch. a batch of 100 trade rows is ~10 KB: over the
+# default 5 KB batch_size_warn_threshold (the server logs a warning) but well under the 50 KB
+# batch_size_fail_threshold that would reject it, and it keeps each coordinator mutation small
+MAX_BATCH_SIZE = 100
+
+def _prepare(session, cql):
+    """Return the cached prepared statement for cql, preparing it on first use."""
+    prepared = _PREPARED.setdefault(session, {})
+    key = (session.keyspace, cql)
+    stmt = prepared.get(key)
+    if stmt is None:
+        stmt = session.prepare(cql)
+        # every statement here binds its full partition key; the driver derives the routing key from
+        # these indexes (protocol v4+) so the token aware policy can send requests straight to a replica
+        if not stmt.routing_key_indexes:
+            log.warning("Prepared statement has no routing key, it will not be token aware: %r", cql.strip().splitlines()[0])
+        prepared[key] = stmt
+    return stmt
+
+
+def partition_batches(stmts, data, partition_key_fn):
+    """Yield UNLOGGED batches for each of stmts where every batch targets a single partition.
+
+    Rows are grouped with partition_key_fn and each group is split into batches of
+    at most MAX_BATCH_SIZE statements. stmts must share the same bind markers: each
+    row is serialized once against the first statement and its values are reused
+    for the others.
+    """
+    first, others = stmts[0], stmts[1:]
+    for _, rows in itertools.groupby(sorted(data, key=partition_key_fn), partition_key_fn):
+        rows = list(rows)
+        for i in range(0, len(rows), MAX_BATCH_SIZE):
+            bound = [first.bind(item) for item in rows[i : i+MAX_BATCH_SIZE]]
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            for b in bound:
+                batch.add(b)
+            yield batch
+            for stmt in others:
+                batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+                for b in bound:
+                    batch.add(_share_values(stmt, b))
+                yield batch
+
+
+def _share_values(stmt, bound):
+    """Bind stmt to the already serialized values of bound."""
+    # relies on driver internals: bind() fills both values (serialized bytes, what the batch
+    # sends) and raw_values (the Python values, used by __repr__), so both are copied here
+    shared = BoundStatement(stmt)
+    shared.values = bound.values
+    shared.raw_values = bound.raw_values
+    return shared
+
+
+def execute_batch(session, stmt, data, partition_key_fn, concurrency=100, timeout=30, total_timeout=600):
+    """Execute stmt for every item in data as single-partition batches sent concurrently."""
+    execute_batches(session, [((stmt,), data)], partition_key_fn, concurrency, timeout, total_timeout)
+
+
+def execute_batches(session, writes, partition_key_fn, concurrency=100, timeout=30, total_timeout=600):
+    """Execute several (stmts, data) writes as single-partition batches sharing one in-flight pool.
+
+    Batches are built lazily while earlier ones are in flight; each is routed on its own
+    (token aware) to a replica owning its partition. Batches that fail are retried as a group.
+    Each request's timeout is capped by what is left of total_timeout, so the whole call is bounded.
+    """
+    deadline = time.monotonic() + total_timeout
+    total_statements = sum(len(data) * len(stmts) for stmts, data in writes)
+    log.info("Executing batches: statements=%d concurrency=%d", total_statements, concurrency)
+    pending = itertools.chain.from_iterable(
+        partition_batches(stmts, data, partition_key_fn) for stmts, data in writes
+    )
+    for attempt in range(1, 4):
+        failed = execute_concurrently(session, pending, concurrency, timeout, deadline)
+        if not failed:
+            break
+        last_exc = failed[0][1]
+        log.warning("Batch execution failed (attempt %d/3): failed_batches=%d error=%s", attempt, len(failed), last_exc)
+        wait = backoff_delay(attempt, 2)
+        if attempt < 3 and time.monotonic() + wait < deadline:
+            pending = [batch for batch, _ in failed]
+            time.sleep(wait)
+        else:
+            # final failure: log and print a concise error for the user
+            log.error("Batch execution failed after retries: %s", last_exc)
+            print(f"ERROR: failed to execute {len(failed)} batches of {total_statements} statements: {last_exc}", file=sys.stderr)
+            raise last_exc
+    log.info("Finished executing batches; total_statements=%d", total_statements)
+
+
+def execute_concurrently(session, statements, concurrency, timeout, deadline):
+    """Execute statements with at most concurrency requests in flight.
+
+    statements may be a generator; it is only advanced when a slot frees up, so just the
+    in-flight statements (and the failed ones) are held in memory. Every request times out
+    after timeout seconds or at deadline (time.monotonic()), whichever comes first; once the
+    deadline has passed no more statements are sent. Returns (statement, exc) for every
+    statement that failed.
+    """
+    slots = threading.Semaphore(concurrency)
+    failed = []
+
+    def handle_success(_, statement):
+        slots.release()
+
+    def handle_error(exc, statement):
+        failed.append((statement, exc))
+        slots.release()
+
+    for statement in statements:
+        slots.acquire()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            failed.append((statement, OperationTimedOut('time budget for the batch writes was exhausted')))
+            slots.release()
+            break
+        future = session.execute_async(statement, timeout=min(timeout, remaining))
+        future.add_callbacks(handle_success, handle_error, callback_args=(statement,), errback_args=(statement,))
+    # wait for the requests still in flight
+    for _ in range(concurrency):
+        slots.acquire()
+    return failed
 
 
 def bulk_insert(session):
-    acc_stmt = session.prepare("INSERT INTO accounts_by_user (username, account_number, cash_balance, name) VALUES (?, ?, ?, ?)")
-    pos_stmt = session.prepare("INSERT INTO positions_by_account(account, symbol, quantity) VALUES (?, ?, ?)")
+    acc_stmt = _prepare(session, "INSERT INTO accounts_by_user (username, account_number, cash_balance, name) VALUES (?, ?, ?, ?)")
+    pos_stmt = _prepare(session, "INSERT INTO positions_by_account(account, symbol, quantity) VALUES (?, ?, ?)")
     # prepare statements for all trade tables to ensure consistent inserts
-    tad_stmt = session.prepare("INSERT INTO trades_by_a_d (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
-    tat_stmt = session.prepare("INSERT INTO trades_by_a_td (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
-    tast_stmt = session.prepare("INSERT INTO trades_by_a_std (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
-    tasd_stmt = session.prepare("INSERT INTO trades_by_a_sd (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
+    tad_stmt = _prepare(session, "INSERT INTO trades_by_a_d (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
+    tat_stmt = _prepare(session, "INSERT INTO trades_by_a_td (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
+    tast_stmt = _prepare(session, "INSERT INTO trades_by_a_std (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
+    tasd_stmt = _prepare(session, "INSERT INTO trades_by_a_sd (account, trade_id, type, symbol, shares, price, amount) VALUES(?, ?, ?, ?, ?, ?, ?)")
     accounts = []
+    # the partition key (username or account) is the first element of every row tuple
+    partition_key_fn = lambda row: row[0]
 
     # Load configuration from fixtures
     accounts_num = DEMO_CONFIG['accounts_count']
@@ -161,7 +293,7 @@ def bulk_insert(session):
     trades_by_account = DEMO_CONFIG['trades_per_account']
    
     # Generate accounts by user
-    log.info(f"Populating demo: accounts={accounts_num}, positions={positions_by_account}, trades={trades_by_account}")
+    log.info("Populating demo: accounts=%d, positions=%d, trades=%d", accounts_num, positions_by_account, trades_by_account)
     data = []
     for i in range(accounts_num):
         user = random.choice(DEMO_USERS)
@@ -169,53 +301,40 @@ def bulk_insert(session):
         accounts.append(account_number)
         cash_balance = random.uniform(0.1, 100000.0)
         data.append((user[0], account_number, cash_balance, user[1]))
-    execute_batch(session, acc_stmt, data)
-    log.info(f"Inserted {len(data)} accounts")
+    execute_batch(session, acc_stmt, data, partition_key_fn)
+    log.info("Inserted %d accounts", len(data))
     
    
     # Generate positions by account
-    # Using a set to track seen (account, symbol) pairs for uniqueness (more efficient than string keys)
-    seen_positions = set()
-    data = []
-    max_attempts = 10000  # Prevent infinite loops on very large datasets
-    attempts = 0
-    while len(data) < positions_by_account and attempts < max_attempts:
-        acc = random.choice(accounts)
-        sym = random.choice(DEMO_INSTRUMENTS)
-        pos_key = (acc, sym)
-        if pos_key not in seen_positions:
-            seen_positions.add(pos_key)
-            quantity = random.randint(1, 500)
-            data.append((acc, sym, quantity))
-        attempts += 1
-    execute_batch(session, pos_stmt, data)
-    log.info(f"Inserted {len(data)} positions")
+    # sample distinct (account, symbol) pairs without replacement so every position is unique
+    all_pairs = [(acc, sym) for acc in accounts for sym in DEMO_INSTRUMENTS]
+    sample = random.sample(all_pairs, min(positions_by_account, len(all_pairs)))
+    data = [(acc, sym, random.randint(1, 500)) for acc, sym in sample]
+    execute_batch(session, pos_stmt, data, partition_key_fn)
+    log.info("Inserted %d positions", len(data))
 
     # Generate trades by account
-    tad_data = []
-    tat_data = []
-    tast_data = []
-    tasd_data = []
-    for i in range(trades_by_account):
-        trade_id = random_date(datetime.datetime(2020, 1, 1), datetime.datetime.now())
-        acc = random.choice(accounts)
-        sym = random.choice(DEMO_INSTRUMENTS)
-        trade_type = random.choice(['buy', 'sell'])
-        shares = random.randint(1, 5000)
-        price = random.uniform(0.1, 100000.0)
-        amount = shares * price
-        # append same data tuple to each trade-table batch so all trade tables stay consistent
-        tup = (acc, trade_id, trade_type, sym, shares, price, amount)
-        tad_data.append(tup)
-        tat_data.append(tup)
-        tast_data.append(tup)
-        tasd_data.append(tup)
-    # execute batches for each trades table (ensure identical data is written to each table)
-    log.info(f"Inserting {len(tad_data)} trades into all trade tables")
-    execute_batch(session, tad_stmt, tad_data)
-    execute_batch(session, tat_stmt, tat_data)
-    execute_batch(session, tast_stmt, tast_data)
-    execute_batch(session, tasd_stmt, tasd_data)
+    # draw each column for all trades at once; random.choices samples k values in a single call
+    start_date = datetime.datetime(2020, 1, 1)
+    days_between_dates = (datetime.datetime.now() - start_date).days
+    trade_accounts = random.choices(accounts, k=trades_by_account)
+    trade_symbols = random.choices(DEMO_INSTRUMENTS, k=trades_by_account)
+    trade_types = random.choices(['buy', 'sell'], k=trades_by_account)
+    trade_shares = random.choices(range(1, 5001), k=trades_by_account)
+    trade_prices = [random.uniform(0.1, 100000.0) for _ in range(trades_by_account)]
+    trade_days = random.choices(range(days_between_dates), k=trades_by_account)
+    start_ts = datetime_to_uuid_timestamp(start_date)
+    trade_ids = make_timeuuids([start_ts + days * UUID_TICKS_PER_DAY for days in trade_days])
+    trades = [
+        (acc, trade_id, trade_type, sym, shares, price, shares * price)
+        for acc, trade_id, sym, trade_type, shares, price
+        in zip(trade_accounts, trade_ids, trade_symbols, trade_types, trade_shares, trade_prices)
+    ]
+    # write all trades tables through one shared pool so their batches overlap; the tables share
+    # their column list, so each trade is serialized once and reused for all four statements
+    log.info("Inserting %d trades into all trade tables", len(trades))
+    trade_writes = [((tad_stmt, tat_stmt, tast_stmt, tasd_stmt), trades)]
+    execute_batches(session, trade_writes, partition_key_fn, concurrency=200)
     log.info("Finished inserting trades into all trade tables")
 
     # Return a summary so callers can present a user-friendly output
@@ -227,61 +346,140 @@ def bulk_insert(session):
     }
 
 
-def random_date(start_date, end_date):
-    time_between_dates = end_date - start_date
-    days_between_dates = time_between_dates.days
-    random_number_of_days = random.randrange(days_between_dates)
-    rand_date = start_date + datetime.timedelta(days=random_number_of_days)
-    return time_uuid.TimeUUID.with_timestamp(time_uuid.mkutime(rand_date))
+def datetime_to_uuid_timestamp(dt):
+    """Convert a naive UTC datetime to 100ns intervals since the UUID epoch (1582-10-15)."""
+    seconds = calendar.timegm(dt.timetuple())
+    return (seconds * 10**7) + (dt.microsecond * 10) + UUID_EPOCH_OFFSET
+
+
+def pack_timeuuid(ts, clock_seq_and_node):
+    """Pack a version 1 (time based) UUID from a 60-bit UUID timestamp following the RFC 4122 layout."""
+    time_low = ts & 0xffffffff
+    time_mid = (ts >> 32) & 0xffff
+    time_hi_version = 0x1000 | ((ts >> 48) & 0x0fff)
+    return uuid.UUID(int=(time_low << 96) | (time_mid << 80) | (time_hi_version << 64) | clock_seq_and_node)
+
+
+def make_timeuuids(timestamps):
+    """Build version 1 (time based) UUIDs for a sequence of 60-bit UUID timestamps.
+
+    The 62 bits of clock sequence and node are random so rows sharing a timestamp don't collide.
+    """
+    getrandbits = random.getrandbits
+    return [pack_timeuuid(ts, UUID_VARIANT_RFC4122 | getrandbits(62)) for ts in timestamps]
+
+
+@functools.lru_cache(maxsize=256)
+def _to_timeuuid_bound(dt, upper):
+    """Return the smallest (or largest when upper) TIMEUUID Cassandra orders at dt.
+
+    Same values as CQL minTimeuuid()/maxTimeuuid(), so range bounds are inclusive of every trade at dt.
+    """
+    clock_seq_and_node = TIMEUUID_MAX_CLOCK_SEQ_AND_NODE if upper else TIMEUUID_MIN_CLOCK_SEQ_AND_NODE
+    return pack_timeuuid(datetime_to_uuid_timestamp(dt), clock_seq_and_node)
 
 
 def create_keyspace(session, keyspace, replication_factor):
-    log.info(f"Creating keyspace: {keyspace} with replication factor {replication_factor}")
+    log.info("Creating keyspace: %s with replication factor %s", keyspace, replication_factor)
     execute_with_retries(session, CREATE_KEYSPACE.format(keyspace, replication_factor))
 
 
 def create_schema(session):
     log.info("Creating model schema")
-    execute_with_retries(session, CREATE_USERS_TABLE)
-    execute_with_retries(session, CREATE_POSITIONS_BY_ACCOUNT_TABLE)
-    execute_with_retries(session, CREATE_TRADES_BY_ACCOUNT_DATE_TABLE)
-    execute_with_retries(session, CREATE_TRADES_BY_ACCOUNT_TYPE_TABLE)
-    execute_with_retries(session, CREATE_TRADES_BY_ACCOUNT_SYMBOL_TYPE_TABLE)
-    execute_with_retries(session, CREATE_TRADES_BY_ACCOUNT_SYMBOL_TABLE)
+    # the tables are independent, so create them concurrently and wait for schema agreement once
+    futures = [(cql, session.execute_async(cql, timeout=30)) for cql in SCHEMA_TABLES]
+    for cql, future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            log.warning("Concurrent CQL execution failed, retrying: %s", e)
+            execute_with_retries(session, cql)
+    session.cluster.refresh_schema_metadata(max_schema_agreement_wait=10)
+
+
+def backoff_delay(attempt, base, cap=30):
+    """Exponential backoff with jitter so clients that failed together don't retry in lockstep."""
+    return min(cap, base * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
 
 
-def execute_with_retries(session, cql, retries=3, timeout=30, delay=5):
+def execute_with_retries(session, cql, retries=3, timeout=30, delay=5, total_timeout=90):
     """Execute a CQL statement with retries and a longer timeout for schema changes.
 
     Uses session.execute(cql, timeout=timeout) and retries on timeout/connection errors.
+    Each attempt's timeout is capped by what is left of total_timeout, so the whole call is bounded.
     """
-    last_exc = None
+    deadline = time.monotonic() + total_timeout
     for attempt in range(1, retries + 1):
         try:
-            log.info(f"Executing CQL (attempt {attempt}/{retries}): {cql.splitlines()[0]!r}")
-            session.execute(cql, timeout=timeout)
-            # small pause to give the cluster time to refresh schema
-            time.sleep(0.2)
+            log.info("Executing CQL (attempt %d/%d): %r", attempt, retries, cql.splitlines()[0])
+            session.execute(cql, timeout=min(timeout, deadline - time.monotonic()))
             return
         except Exception as e:
-            last_exc = e
-            log.warning(f"CQL execution failed (attempt {attempt}/{retries}): {e}")
-            if attempt < retries:
-                time.sleep(delay * attempt)
+            log.warning("CQL execution failed (attempt %d/%d): %s", attempt, retries, e)
+            wait = backoff_delay(attempt, delay)
+            if attempt < retries and time.monotonic() + wait < deadline:
+                time.sleep(wait)
             else:
-                log.error(f"Giving up executing CQL after {retries} attempts")
+                log.error("Giving up executing CQL after %d attempts", attempt)
                 raise
 
 
+def execute_paged(session, stmt, handle_rows):
+    """Execute stmt asynchronously, calling handle_rows with each result page as it arrives.
+
+    Blocks until the last page has been handled and re-raises any query or callback error.
+    """
+    done = threading.Event()
+    errors = []
+    future = session.execute_async(stmt)
+
+    def handle_page(rows):
+        try:
+            handle_rows(rows)
+        except Exception as e:
+            errors.append(e)
+            done.set()
+            return
+        if future.has_more_pages:
+            future.start_fetching_next_page()
+        else:
+            done.set()
+
+    def handle_error(exc):
+        errors.append(exc)
+        done.set()
+
+    future.add_callbacks(handle_page, handle_error)
+    done.wait()
+    if errors:
+        raise errors[0]
+
+
+def _fast_tabulate(rows, headers):
+    """Render string cells as a github style table, measuring column widths in a single pass."""
+    # like tabulate, headers get at least two spaces of padding
+    widths = [len(h) + 2 for h in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+    lines = [
+        '| ' + ' | '.join(h.ljust(w) for h, w in zip(headers, widths)) + ' |',
+        '|' + '|'.join('-' * (w + 2) for w in widths) + '|',
+    ]
+    lines.extend('| ' + ' | '.join(cell.ljust(w) for cell, w in zip(row, widths)) + ' |' for row in rows)
+    return '\n'.join(lines)
+
+
 def get_user_accounts(session, username):
-    log.info(f"Retrieving {username} accounts")
-    stmt = session.prepare(SELECT_USER_ACCOUNTS)
+    log.info("Retrieving %s accounts", username)
+    stmt = _prepare(session, SELECT_USER_ACCOUNTS)
     rows = session.execute(stmt, [username])
 
     rows_list = []
     for row in rows:
-        name = row.name if hasattr(row, 'name') and row.name is not None else ''
-        balance = float(row.cash_balance) if hasattr(row, 'cash_balance') and row.cash_balance is not None else 0.0
+        name = row.name if row.name is not None else ''
+        balance = row.cash_balance if row.cash_balance is not None else 0.0
         balance_str = f"${balance:,.2f}"
         rows_list.append([row.account_number, name, balance_str])
 
@@ -290,13 +488,13 @@ def get_user_accounts(session, username):
         return
 
     headers = ['Account', 'Name', 'Cash Balance']
-    print(tabulate(rows_list, headers=headers, tablefmt='github'))
+    print(_fast_tabulate(rows_list, headers))
 
 
 def get_positions_by_account(session, account):
     """Print positions for a given account in a human readable table."""
-    log.info(f"Retrieving positions for account {account}")
-    stmt = session.prepare(SELECT_POSITIONS_BY_ACCOUNT)
+    log.info("Retrieving positions for account %s", account)
+    stmt = _prepare(session, SELECT_POSITIONS_BY_ACCOUNT)
     rows = session.execute(stmt, [account])
 
     print(f"Positions for account {account}:")
@@ -309,21 +507,20 @@ def get_positions_by_account(session, account):
         return
 
     headers = ['Symbol', 'Quantity']
-    print(tabulate(rows_list, headers=headers, tablefmt='github'))
+    print(_fast_tabulate(rows_list, headers))
 
 
 def parse_date_string(s):
+    """Parse 'YYYY-M[M]-D[D]' or 'YYYY-M[M]-D[D][T ]H[H]:M[M]:S[S]' (other ISO forms as a fallback); None if invalid."""
     if not s:
         return None
-    for fmt in ('%Y-%m-%d', '%Y-%m-%dT%H:%M:%S'):
-        try:
-            return datetime.datetime.strptime(s, fmt)
-        except Exception:
-            continue
+    m = ISO_DATE_RE.fullmatch(s)
     try:
+        if m:
+            return datetime.datetime(*map(int, m.groups(default='0')))
         # try fromisoformat as a last resort
         return datetime.datetime.fromisoformat(s)
-    except Exception:
+    except ValueError:
         return None
 
 
@@ -332,14 +529,14 @@ def get_trades_by_account(session, account, start_date=None, end_date=None, limi
 
     table_key: one of TRADE_TABLES keys ('by_date','by_type','by_symbol','by_symbol_type')
     trade_type, symbol: optional filters used depending on table schema
+    start_date, end_date: optional datetime bounds (see parse_date_string)
     """
-    log.info(f"Retrieving trades for account {account} from {start_date} to {end_date} on {table_key}")
+    log.info("Retrieving trades for account %s from %s to %s on %s", account, start_date, end_date, table_key)
 
     if table_key not in TRADE_TABLES:
         raise ValueError('unknown trade table key')
-
-    start_dt = parse_date_string(start_date)
-    end_dt = parse_date_string(end_date)
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
 
     table_name = TRADE_TABLES[table_key]['table']
     supports = TRADE_TABLES[table_key]['supports']
@@ -357,49 +554,50 @@ def get_trades_by_account(session, account, start_date=None, end_date=None, limi
         params.append(trade_type)
 
     # translate start/end dates to timeuuid bounds when present
-    if start_dt and end_dt:
-        start_tu = time_uuid.TimeUUID.with_timestamp(time_uuid.mkutime(start_dt))
-        end_tu = time_uuid.TimeUUID.with_timestamp(time_uuid.mkutime(end_dt))
+    if start_date and end_date:
+        start_tu = _to_timeuuid_bound(start_date, False)
+        end_tu = _to_timeuuid_bound(end_date, True)
         cql += ' AND trade_id >= ? AND trade_id <= ?'
         params.extend([start_tu, end_tu])
-    elif start_dt:
-        start_tu = time_uuid.TimeUUID.with_timestamp(time_uuid.mkutime(start_dt))
+    elif start_date:
+        start_tu = _to_timeuuid_bound(start_date, False)
         cql += ' AND trade_id >= ?'
         params.append(start_tu)
-    elif end_dt:
-        end_tu = time_uuid.TimeUUID.with_timestamp(time_uuid.mkutime(end_dt))
+    elif end_date:
+        end_tu = _to_timeuuid_bound(end_date, True)
         cql += ' AND trade_id <= ?'
         params.append(end_tu)
 
-    # Apply limit client-side for consistency with prepared statement pattern
-    stmt = session.prepare(cql)
-    rows = session.execute(stmt, params)
+    # push the limit to Cassandra and fetch it as a single page
+    cql += ' LIMIT ?'
+    params.append(limit)
+
+    stmt = _prepare(session, cql)
+    bound = stmt.bind(params)
+    bound.fetch_size = limit
 
     rows_list = []
-    row_count = 0
-    for row in rows:
-        if row_count >= limit:
-            break
-        
-        trade_id = row.trade_id
-        trade_ts = None
-        try:
-            if hasattr(trade_id, 'time'):
-                ts = (trade_id.time - 0x01b21dd213814000) / 1e7
-                trade_ts = datetime.datetime.fromtimestamp(ts)
-        except Exception:
-            trade_ts = None
-
-        when = trade_ts.isoformat(sep=' ') if trade_ts else str(trade_id)
-        shares_str = f"{row.shares:,}"
-        price_str = f"${float(row.price):,.2f}"
-        amount_str = f"${float(row.amount):,.2f}"
-        rows_list.append([when, row.type, row.symbol, shares_str, price_str, amount_str])
-        row_count += 1
+
+    def handle_rows(rows):
+        for row in rows:
+            trade_id = row.trade_id
+            # the driver returns TIMEUUID columns as uuid.UUID; version 1 carries the trade time
+            if trade_id.version == 1:
+                trade_ts = datetime.datetime.fromtimestamp((trade_id.time - UUID_EPOCH_OFFSET) / 1e7)
+                when = f"{trade_ts:%Y-%m-%d %H:%M:%S}"
+            else:
+                when = str(trade_id)
+            shares_str = f"{row.shares:,}"
+            price_str = f"${row.price:,.2f}"
+            amount_str = f"${row.amount:,.2f}"
+            rows_list.append([when, row.type, row.symbol, shares_str, price_str, amount_str])
+
+    # format each page as soon as it arrives instead of blocking on the full result
+    execute_paged(session, bound, handle_rows)
 
     if not rows_list:
         print('No trades found for this account with the given filters.')
         return
 
     headers = ['Datetime/ID', 'Type', 'Symbol', 'Shares', 'Price', 'Amount']
-    print(tabulate(rows_list, headers=headers, tablefmt='github'))
\ No newline at end of file
+    print(_fast_tabulate(rows_list, headers))
\ No newline at end of file